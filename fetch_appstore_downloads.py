@@ -1,12 +1,100 @@
 import jwt
 import requests
-import gzip
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import gspread
+from gspread.exceptions import APIError
+from gspread.utils import absolute_range_name
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
 import os
+import sys
 import io
+import csv
+import itertools
+import time
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# isa-l（SIMD対応のDEFLATE実装）があればgzip展開に使う
+try:
+    from isal.igzip import IGzipFile as GzipFile
+except ImportError:
+    from gzip import GzipFile
+
+log = logging.getLogger(__name__)
+
+# parse_reportで使用するレポートの列（これ以外の列は読み込まない）
+_REPORT_COLUMNS = {
+    'Product Type Identifier', 'Title', 'SKU', 'Country Code', 'Device',
+    'Units', 'Developer Proceeds', 'Customer Price', 'Customer Currency',
+    'Promo Code', 'Installation Type', 'Install Event'
+}
+
+# 国コード → 地域
+_REGION_BY_COUNTRY = {
+    'JP': 'Asia', 'CN': 'Asia', 'KR': 'Asia', 'TW': 'Asia', 'HK': 'Asia',
+    'US': 'North America', 'CA': 'North America', 'MX': 'North America',
+    'GB': 'Europe', 'DE': 'Europe', 'FR': 'Europe', 'IT': 'Europe', 'ES': 'Europe',
+    'BR': 'South America', 'AR': 'South America',
+    'AU': 'Oceania', 'NZ': 'Oceania'
+}
+# カテゴリのコード順に並べた地域の配列（未登録の国はコード-1になる）
+_REGION_CAT = pd.CategoricalDtype(list(_REGION_BY_COUNTRY))
+_REGION_LOOKUP = np.array(list(_REGION_BY_COUNTRY.values()), dtype=object)
+
+# ダウンロードとして扱うProduct Type Identifier
+_DOWNLOAD_PRODUCT_TYPES = {b'1', b'1F', b'7'}
+
+
+def _filter_download_lines(lines):
+    """ヘッダー行と、ダウンロードのProduct Typeに該当する行だけを返す（bytesの行を受け取る。空のレポートなら何も返さない）"""
+    header = next(lines, b'')
+    if not header.strip():
+        return
+    yield header
+    
+    idx = header.rstrip(b'\r\n').split(b'\t').index(b'Product Type Identifier')
+    for line in lines:
+        fields = line.split(b'\t', idx + 1)
+        if len(fields) > idx and fields[idx].rstrip(b'\r\n') in _DOWNLOAD_PRODUCT_TYPES:
+            yield line
+
+
+class _LineStream(io.RawIOBase):
+    """bytesの行のイテレータをread_csvに渡せるファイルライクオブジェクトにする（全体をメモリに溜めない）"""
+    def __init__(self, lines):
+        self._lines = lines
+        self._buf = b''
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, b):
+        # 1回の呼び出しでbに収まるだけ行をまとめて詰める（行ごとの呼び出しやコピーにしない）
+        size = len(b)
+        chunks = [self._buf]
+        total = len(self._buf)
+        for line in self._lines:
+            chunks.append(line)
+            total += len(line)
+            if total >= size:
+                break
+        data = b''.join(chunks)
+        n = min(size, len(data))
+        b[:n] = data[:n]
+        self._buf = data[n:]
+        return n
 
 class AppStoreDownloadTracker:
     def __init__(self, key_id, issuer_id, private_key_path, 
@@ -17,22 +105,41 @@ class AppStoreDownloadTracker:
         self.google_creds_path = google_creds_path
         self.sheet_name = sheet_name
         
+        # 秘密鍵は一度だけ読み込み、PEMをパース済みの鍵オブジェクトとして保持
+        with open(self.private_key_path, 'rb') as f:
+            self._private_key = load_pem_private_key(f.read(), password=None)
+        
+        # JWTのうち固定の部分（expだけ生成時に付与）
+        self._jwt_claims_base = {'iss': issuer_id, 'aud': 'appstoreconnect-v1'}
+        self._jwt_headers = {'kid': key_id}
+        
+        # 生成済みトークンと有効期限（UNIX時間）
+        self._token = None
+        self._token_exp = 0
+        # 並列取得時に複数スレッドが同時に署名しないようにするロック
+        self._token_lock = threading.Lock()
+        
+        # 複数日取得時にTCP/TLS接続を使い回すためのセッション
+        self.session = requests.Session()
+        
+        # Sheets REST APIを直接呼ぶための認証済みセッション（connect_to_sheetsで作成）
+        self._sheets_session = None
+        
     def generate_token(self):
-        """App Store Connect APIのJWTトークンを生成"""
-        with open(self.private_key_path, 'r') as f:
-            private_key = f.read()
-        
-        token = jwt.encode(
-            {
-                'iss': self.issuer_id,
-                'exp': datetime.utcnow() + timedelta(minutes=20),
-                'aud': 'appstoreconnect-v1'
-            },
-            private_key,
-            algorithm='ES256',
-            headers={'kid': self.key_id}
-        )
-        return token
+        """App Store Connect APIのJWTトークンを生成（有効期限の1分前まで再利用）"""
+        with self._token_lock:
+            if self._token and time.time() < self._token_exp - 60:
+                return self._token
+            
+            exp = int(time.time()) + 20 * 60
+            self._token = jwt.encode(
+                {**self._jwt_claims_base, 'exp': exp},
+                self._private_key,
+                algorithm='ES256',
+                headers=self._jwt_headers
+            )
+            self._token_exp = exp
+            return self._token
     
     def get_sales_report(self, vendor_number, report_date):
         """App Store Connectからダウンロード数を取得"""
@@ -52,97 +159,114 @@ class AppStoreDownloadTracker:
             'filter[reportDate]': report_date
         }
         
-        print(f"レポート取得中: {report_date}")
-        response = requests.get(url, headers=headers, params=params)
+        log.info("レポート取得中: %s", report_date)
+        response = self.session.get(url, headers=headers, params=params, stream=True)
         
         if response.status_code == 200:
-            data = gzip.decompress(response.content).decode('utf-8')
-            return data
+            # gzipのまま生ストリームを返し、parse_reportで展開しながら読み込む
+            response.raw.decode_content = False
+            return response.raw
         elif response.status_code == 404:
-            print(f"レポートが見つかりません（データがない可能性があります）")
+            log.warning("レポートが見つかりません（データがない可能性があります）: %s", report_date)
+            # 本文を読み切ってから閉じ、接続をセッションのプールに戻す
+            response.content
+            response.close()
             return None
         else:
-            print(f"エラー: {response.status_code}")
-            print(response.text)
+            log.error("エラー: %s\n%s", response.status_code, response.text)
+            response.close()
             return None
     
     def parse_report(self, report_data, report_date):
-        """レポートをパースしてダウンロード数を抽出"""
-        if not report_data:
+        """レポートをパースしてダウンロード数を抽出（report_dataはgzip圧縮されたファイルライクオブジェクト）"""
+        if report_data is None:
             return pd.DataFrame()
         
-        lines = report_data.strip().split('\n')
-        header = lines[0].split('\t')
-        data = [line.split('\t') for line in lines[1:]]
-        
-        df = pd.DataFrame(data, columns=header)
+        # gzipを展開しながらTSVをpandasのCパーサーで読み込み（空欄はNaNにせず空文字のまま）
+        # ダウンロード以外の行はDataFrameにする前に読み飛ばす（行単位で流し込むのでレポート全体は保持しない）
+        with report_data, GzipFile(fileobj=report_data) as f:
+            lines = _filter_download_lines(f)
+            header = next(lines, None)
+            if header is None:
+                log.info("レポートが空です: %s", report_date)
+                return pd.DataFrame()
+            
+            filtered = io.BufferedReader(_LineStream(itertools.chain([header], lines)))
+            df = pd.read_csv(
+                filtered,
+                sep='\t',
+                usecols=lambda c: c in _REPORT_COLUMNS,
+                # 数値列のみ読み込み時に型変換し、それ以外は文字列のまま
+                dtype=defaultdict(lambda: str, {
+                    'Units': 'int32',
+                    'Developer Proceeds': 'float64'
+                }),
+                engine='c',
+                encoding='utf-8',
+                keep_default_na=False,
+                quoting=csv.QUOTE_NONE
+            )
         
         # デバッグ: 利用可能な列名を表示
-        print(f"利用可能な列: {df.columns.tolist()}")
+        log.debug("利用可能な列: %s", df.columns.tolist())
         
-        # ダウンロードのみを抽出
-        downloads = df[df['Product Type Identifier'].isin(['1', '1F', '7'])].copy()
+        # レポートの列名 → シートの列名
+        column_map = {
+            'Title': 'App Name',
+            'SKU': 'SKU',
+            'Country Code': 'Country',
+            'Device': 'Device',
+            'Units': 'Units',
+            'Developer Proceeds': 'Proceeds',
+            'Customer Price': 'Customer Price',
+            'Customer Currency': 'Currency',
+            'Product Type Identifier': 'Product Type',
+            'Promo Code': 'Promo Code'
+        }
         
-        if downloads.empty:
-            print("ダウンロードデータがありません")
+        # Installation Typeが存在する場合のみ追加
+        if 'Installation Type' in df.columns:
+            column_map['Installation Type'] = 'Install Type'
+        elif 'Install Event' in df.columns:
+            column_map['Install Event'] = 'Install Type'
+        
+        # 必要な列を1回で切り出す（ダウンロード行の抽出は読み込み時に済んでいる）
+        # （元のdfは以降使わないのでデータのコピーは不要。shallow copyで新しいフレームとして扱う）
+        result = df.loc[:, list(column_map)].copy(deep=False)
+        
+        if result.empty:
+            log.info("ダウンロードデータがありません")
             return pd.DataFrame()
         
-        # 基本のデータフレーム（Installation Typeを除外）
-        result = pd.DataFrame({
-            'Date': report_date,
-            'App Name': downloads['Title'],
-            'SKU': downloads['SKU'],
-            'Country': downloads['Country Code'],
-            'Device': downloads['Device'],
-            'Units': downloads['Units'].astype(int),
-            'Proceeds': downloads['Developer Proceeds'].astype(float),
-            'Customer Price': downloads['Customer Price'],
-            'Currency': downloads['Customer Currency'],
-            'Product Type': downloads['Product Type Identifier'],
-            'Promo Code': downloads['Promo Code']
-        })
+        result.columns = list(column_map.values())
+        result.insert(0, 'Date', report_date)
         
-        # Installation Typeが存在する場合のみ追加
-        if 'Installation Type' in downloads.columns:
-            result['Install Type'] = downloads['Installation Type']
-        elif 'Install Event' in downloads.columns:
-            result['Install Type'] = downloads['Install Event']
-        else:
+        if 'Install Type' not in result.columns:
             result['Install Type'] = 'N/A'
-            print("注意: Installation Type列が見つかりません")
-        
-        # 追加の計算項目
-        result['Year'] = pd.to_datetime(result['Date']).dt.year
-        result['Month'] = pd.to_datetime(result['Date']).dt.month
-        result['Week'] = pd.to_datetime(result['Date']).dt.isocalendar().week
-        result['Weekday'] = pd.to_datetime(result['Date']).dt.day_name()
-        
-        # 地域マッピング
-        region_map = {
-            'JP': 'Asia', 'CN': 'Asia', 'KR': 'Asia', 'TW': 'Asia', 'HK': 'Asia',
-            'US': 'North America', 'CA': 'North America', 'MX': 'North America',
-            'GB': 'Europe', 'DE': 'Europe', 'FR': 'Europe', 'IT': 'Europe', 'ES': 'Europe',
-            'BR': 'South America', 'AR': 'South America',
-            'AU': 'Oceania', 'NZ': 'Oceania'
-        }
-        result['Region'] = result['Country'].map(region_map).fillna('Other')
+            log.warning("注意: Installation Type列が見つかりません")
         
-        # カラムの順序を明示的に指定
-        result = result[[
-            'Date', 'Year', 'Month', 'Week', 'Weekday',
-            'App Name', 'SKU', 'Country', 'Region', 'Device',
-            'Install Type', 'Units', 'Proceeds', 'Customer Price',
-            'Currency', 'Product Type', 'Promo Code'
-        ]]
-        
-        # デバッグ情報を表示
-        print(f"データフレームの形状: {result.shape}")
-        print(f"データフレームのカラム: {result.columns.tolist()}")
-        print(f"最初の行サンプル:")
-        print(result.iloc[0].tolist())
+        # 追加の計算項目（Dateは全行同じなので一度だけ計算）
+        d = datetime.strptime(report_date, '%Y-%m-%d')
+        iso = d.isocalendar()
+        result['Year'] = d.year
+        result['Month'] = d.month
+        result['Week'] = iso[1]
+        result['Weekday'] = d.strftime('%A')
+        
+        # 地域マッピング（国コードをカテゴリのコードに変換し、配列の添字参照で地域を割り当てる）
+        codes = result['Country'].astype(_REGION_CAT).cat.codes.to_numpy()
+        result['Region'] = np.where(
+            codes >= 0, _REGION_LOOKUP[codes.clip(0)], 'Other')
+        
+        # デバッグ情報を表示（行の取り出しは重いのでDEBUG時のみ）
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("データフレームの形状: %s", result.shape)
+            log.debug("データフレームのカラム: %s", result.columns.tolist())
+            log.debug("最初の行サンプル: %s", result.iloc[0].tolist())
 
         # 重複行を集約（Units と Proceeds を合計）
-        print(f"集約前の行数: {len(result)}")
+        # 出力のカラム順はgroupbyのキー順 + 集計列で決まるため、事前の並べ替えは不要
+        log.debug("集約前の行数: %d", len(result))
         result = result.groupby([
             'Date', 'Year', 'Month', 'Week', 'Weekday',
             'App Name', 'SKU', 'Country', 'Region', 'Device',
@@ -151,7 +275,7 @@ class AppStoreDownloadTracker:
             'Units': 'sum',
             'Proceeds': 'sum'
         })
-        print(f"集約後の行数: {len(result)}")
+        log.debug("集約後の行数: %d", len(result))
         
         return result
     
@@ -169,45 +293,46 @@ class AppStoreDownloadTracker:
         
         if creds_json:
             # 環境変数から認証情報を取得（GitHub Actions用）
-            print("環境変数からGoogle認証情報を読み込み中...")
+            log.info("環境変数からGoogle認証情報を読み込み中...")
             try:
                 creds_dict = json.loads(creds_json)
-                print("✅ JSON解析成功")
+                log.info("✅ JSON解析成功")
             except json.JSONDecodeError as e:
-                print(f"❌ JSON解析エラー: {e}")
-                print(f"JSONの最初の100文字: {creds_json[:100]}")
+                log.error("❌ JSON解析エラー: %s", e)
+                log.error("JSONの最初の100文字: %s", creds_json[:100])
                 raise
             
             creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-            print("✅ Google認証情報の作成成功")
+            log.info("✅ Google認証情報の作成成功")
         else:
             # ファイルから認証情報を取得（ローカル実行用）
-            print(f"ファイルからGoogle認証情報を読み込み中: {self.google_creds_path}")
+            log.info("ファイルからGoogle認証情報を読み込み中: %s", self.google_creds_path)
             creds = Credentials.from_service_account_file(
                 self.google_creds_path, scopes=scope)
         
         client = gspread.authorize(creds)
-        print("✅ gspread認証成功")
+        self._sheets_session = AuthorizedSession(creds)
+        log.info("✅ gspread認証成功")
         
         return client.open(self.sheet_name)
     
     def save_to_sheets(self, df):
         """Google Sheetsにデータを保存"""
         if df.empty:
-            print("保存するデータがありません")
+            log.info("保存するデータがありません")
             return
         
-        print(f"\nGoogle Sheetsに保存中: {len(df)}行")
+        log.info("\nGoogle Sheetsに保存中: %d行", len(df))
         
         try:
             spreadsheet = self.connect_to_sheets()
-            print(f"✅ スプレッドシート '{self.sheet_name}' を開きました")
+            log.info("✅ スプレッドシート '%s' を開きました", self.sheet_name)
             
             worksheet = spreadsheet.sheet1
-            print("✅ ワークシート取得成功")
+            log.info("✅ ワークシート取得成功")
             
-            # 既存データを取得
-            existing_data = worksheet.get_all_values()
+            # A列のみ取得（ヘッダー判定と最終行の算出に使う。シート全体は読まない）
+            existing_dates = worksheet.col_values(1)
             
             expected_header = [
                 'Date', 'Year', 'Month', 'Week', 'Weekday',
@@ -216,60 +341,124 @@ class AppStoreDownloadTracker:
                 'Currency', 'Product Type', 'Promo Code'
             ]
             
+            # 書き込み開始行（既存データの次の行）
+            start_row = len(existing_dates) + 1
+            
             # ヘッダーがない場合は追加
-            if not existing_data or len(existing_data) == 0 or len(existing_data[0]) == 0 or existing_data[0][0] != 'Date':
-                print(f"ヘッダーを追加: {len(expected_header)}列")
+            if not existing_dates or existing_dates[0] != 'Date':
+                log.info("ヘッダーを追加: %d列", len(expected_header))
                 worksheet.insert_row(expected_header, 1)
+                start_row += 1
             else:
-                print(f"既存のヘッダーが見つかりました")
+                log.info("既存のヘッダーが見つかりました")
+            
+            # データを変換（object配列経由でPythonネイティブのint/float/strにしておく）
+            df_out = df.astype({'Units': int, 'Proceeds': float})
+            data_to_append = df_out.to_numpy(dtype=object, na_value='').tolist()
             
-            # データを変換
-            data_to_append = df.values.tolist()
+            log.info("\n追加するデータ:")
+            log.info("  行数: %d", len(data_to_append))
+            log.info("  各行のカラム数: %d", len(data_to_append[0]) if data_to_append else 0)
             
-            print(f"\n追加するデータ:")
-            print(f"  行数: {len(data_to_append)}")
-            print(f"  各行のカラム数: {len(data_to_append[0]) if data_to_append else 0}")
+            # 書き込み範囲を明示して1回のリクエストで追記
+            end_row = start_row + len(data_to_append) - 1
+            if end_row > worksheet.row_count:
+                worksheet.add_rows(end_row - worksheet.row_count)
             
-            # データを追記
-            worksheet.append_rows(data_to_append)
+            end_col = chr(ord('A') + len(expected_header) - 1)
+            self.update_values(
+                worksheet, f'A{start_row}:{end_col}{end_row}', data_to_append)
             
-            print(f"\n✅ 保存完了: {len(df)}行")
-            print(f"合計ダウンロード数: {df['Units'].sum()}")
+            log.info("\n✅ 保存完了: %d行", len(df))
+            log.info("合計ダウンロード数: %s", df['Units'].sum())
             
         except Exception as e:
-            print(f"\n❌ エラーが発生しました: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            log.exception("\n❌ エラーが発生しました: %s", e)
     
-    def run(self, vendor_number, days_back=1):
-        """メイン処理: データ取得とシート保存"""
-        # 指定日数前の日付を取得
-        target_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+    def update_values(self, worksheet, cell_range, values):
+        """指定範囲にvalues.updateで書き込み（orjsonがあればリクエストボディをorjsonでエンコード）"""
+        if orjson is None:
+            worksheet.update(
+                range_name=cell_range, values=values, value_input_option='RAW')
+            return
         
-        print(f"=== App Store ダウンロード数取得開始 ===")
-        print(f"対象日: {target_date}")
+        if self._sheets_session is None:
+            raise RuntimeError("connect_to_sheets()を先に呼び出してください")
         
-        # レポート取得
-        report = self.get_sales_report(vendor_number, target_date)
+        a1 = quote(absolute_range_name(worksheet.title, cell_range), safe='')
+        url = (f'https://sheets.googleapis.com/v4/spreadsheets/'
+               f'{worksheet.spreadsheet.id}/values/{a1}')
+        response = self._sheets_session.put(
+            url,
+            params={'valueInputOption': 'RAW'},
+            data=orjson.dumps({'values': values}),
+            headers={'Content-Type': 'application/json'}
+        )
+        # gspread経由の場合と同じくAPIErrorとして送出
+        if not response.ok:
+            raise APIError(response)
+    
+    def fetch_day(self, vendor_number, report_date):
+        """1日分のレポートを取得してパース（例外で失敗した日はログを出してNoneを返し、他の日の処理は続ける）"""
+        try:
+            report = self.get_sales_report(vendor_number, report_date)
+            
+            # 取得できなかった理由はget_sales_reportでログ出力済み
+            if report is None:
+                return pd.DataFrame()
+            
+            return self.parse_report(report, report_date)
+        except Exception:
+            log.exception("レポートの取得・パースでエラーが発生しました: %s", report_date)
+            return None
+    
+    def run(self, vendor_number, days_back=1, num_days=1):
+        """メイン処理: データ取得とシート保存（days_back日前から遡ってnum_days日分）"""
+        if num_days < 1:
+            raise ValueError(f"num_daysは1以上を指定してください: {num_days}")
+        
+        # 指定日数前からの日付リストを作成
+        today = datetime.now()
+        target_dates = [
+            (today - timedelta(days=days_back + i)).strftime('%Y-%m-%d')
+            for i in range(num_days)
+        ]
+        
+        log.info("=== App Store ダウンロード数取得開始 ===")
+        log.info("対象日: %s", ', '.join(target_dates))
+        
+        # レポート取得とパース（I/O待ちが中心なので日付ごとに並列実行）
+        with ThreadPoolExecutor(max_workers=min(8, len(target_dates))) as executor:
+            frames = list(executor.map(
+                lambda d: self.fetch_day(vendor_number, d), target_dates))
         
-        if report:
-            # パース
-            df = self.parse_report(report, target_date)
+        failed_dates = [d for d, f in zip(target_dates, frames) if f is None]
+        frames = [f for f in frames if f is not None and not f.empty]
+        
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
             
-            if not df.empty:
-                # Google Sheetsに保存
-                self.save_to_sheets(df)
-                
-                # サマリー表示
-                print("\n=== サマリー ===")
-                print(df.groupby('App Name')['Units'].sum())
-            else:
-                print("データがありませんでした")
+            # Google Sheetsに保存
+            self.save_to_sheets(df)
+            
+            # サマリー表示
+            log.info("\n=== サマリー ===\n%s", df.groupby('App Name')['Units'].sum())
         else:
-            print("レポートを取得できませんでした")
+            log.info("データがありませんでした")
+        
+        # 成功した日の保存後に、失敗した日があればエラーとして終了させる（Actionsのジョブを失敗扱いにする）
+        if failed_dates:
+            raise RuntimeError(f"レポートの取得・パースに失敗した日があります: {', '.join(failed_dates)}")
 
 # メイン実行
 def main():
+    # ログ出力（LOG_LEVEL=DEBUGでパース時のデバッグ情報も表示）
+    logging.basicConfig(
+        level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+        format='%(message)s',
+        stream=sys.stdout
+    )
+    
     # 環境変数から取得（GitHub Actions用）
     KEY_ID = os.environ.get('KEY_ID')
     ISSUER_ID = os.environ.get('ISSUER_ID')
@@ -278,21 +467,23 @@ def main():
     
     GOOGLE_CREDS_PATH = os.environ.get('GOOGLE_CREDS_PATH', 'credentials.json')
     SHEET_NAME = os.environ.get('SHEET_NAME', 'Daily Downloads')
+    # 取得する日数（2以上で複数日を並列取得）
+    NUM_DAYS = int(os.environ.get('NUM_DAYS', '1'))
     
     # デバッグ用（値が設定されているか確認）
     if not KEY_ID:
-        print("エラー: KEY_ID環境変数が設定されていません")
+        log.error("エラー: KEY_ID環境変数が設定されていません")
         return
     if not ISSUER_ID:
-        print("エラー: ISSUER_ID環境変数が設定されていません")
+        log.error("エラー: ISSUER_ID環境変数が設定されていません")
         return
     if not VENDOR_NUMBER:
-        print("エラー: VENDOR_NUMBER環境変数が設定されていません")
+        log.error("エラー: VENDOR_NUMBER環境変数が設定されていません")
         return
     
-    print(f"KEY_ID: {KEY_ID[:5]}... (設定済み)")
-    print(f"ISSUER_ID: {ISSUER_ID[:10]}... (設定済み)")
-    print(f"VENDOR_NUMBER: {VENDOR_NUMBER} (設定済み)")
+    log.info("KEY_ID: %s... (設定済み)", KEY_ID[:5])
+    log.info("ISSUER_ID: %s... (設定済み)", ISSUER_ID[:10])
+    log.info("VENDOR_NUMBER: %s (設定済み)", VENDOR_NUMBER)
     
     tracker = AppStoreDownloadTracker(
         key_id=KEY_ID,
@@ -303,7 +494,7 @@ def main():
     )
     
     # 昨日のデータを取得（days_back=1）
-    tracker.run(vendor_number=VENDOR_NUMBER, days_back=3)
+    tracker.run(vendor_number=VENDOR_NUMBER, days_back=3, num_days=NUM_DAYS)
 
 if __name__ == '__main__':
     main()